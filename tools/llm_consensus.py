@@ -9,10 +9,22 @@ Queries 9 LLMs in parallel with the SAME question for consensus.
 import os
 import json
 import asyncio
+import functools
 import aiohttp
 from dataclasses import dataclass
 import time
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 # The SAME question for ALL models - ROUND 2 with GPU capabilities
 CONSENSUS_PROMPT = """You are a chess engine development expert advising on NikolaChess.
 
@@ -48,16 +60,13 @@ Provide:
 
 Focus on concepts and reasoning, not code examples."""
 
+@functools.lru_cache(maxsize=1)
 def load_env():
     env_path = os.path.expanduser("~/.claude-ultimate/.env")
-    keys = {}
     with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                k, v = line.split('=', 1)
-                keys[k] = v
-    return keys
+        lines = [line.strip() for line in f.read().splitlines()]
+    return dict(line.split('=', 1) for line in lines
+                if line and not line.startswith('#') and '=' in line)
 
 ENV = load_env()
 
@@ -90,12 +99,18 @@ LLMS = [
               "https://open.bigmodel.cn/api/paas/v4/chat/completions", "glm-4.7", "zhipu"),
 ]
 
+async def post_json(session, url, **kwargs):
+    # Hand the connection back to the pool before decoding the body
+    async with session.post(url, **kwargs) as resp:
+        body = await resp.read()
+        resp.release()
+    return json_loads(body)
+
 async def query_anthropic(session, config):
     headers = {"x-api-key": config.api_key, "anthropic-version": "2023-06-01", "content-type": "application/json"}
     payload = {"model": config.model, "max_tokens": 2000, "messages": [{"role": "user", "content": CONSENSUS_PROMPT}]}
-    async with session.post(config.base_url, headers=headers, json=payload) as resp:
-        data = await resp.json()
-        return data.get("content", [{}])[0].get("text", f"ERROR: {data}")
+    data = await post_json(session, config.base_url, headers=headers, json=payload)
+    return data.get("content", [{}])[0].get("text", f"ERROR: {data}")
 
 async def query_openai(session, config):
     headers = {"Authorization": f"Bearer {config.api_key}", "Content-Type": "application/json"}
@@ -104,37 +119,34 @@ async def query_openai(session, config):
         payload = {"model": config.model, "max_completion_tokens": 2000, "messages": [{"role": "user", "content": CONSENSUS_PROMPT}]}
     else:
         payload = {"model": config.model, "max_tokens": 2000, "messages": [{"role": "user", "content": CONSENSUS_PROMPT}]}
-    async with session.post(config.base_url, headers=headers, json=payload) as resp:
-        data = await resp.json()
-        choices = data.get("choices", [])
-        return choices[0]["message"]["content"] if choices else f"ERROR: {data}"
+    data = await post_json(session, config.base_url, headers=headers, json=payload)
+    choices = data.get("choices", [])
+    return choices[0]["message"]["content"] if choices else f"ERROR: {data}"
 
 async def query_gemini(session, config):
     url = f"{config.base_url}/{config.model}:generateContent?key={config.api_key}"
     payload = {"contents": [{"parts": [{"text": CONSENSUS_PROMPT}]}], "generationConfig": {"maxOutputTokens": 600}}
-    async with session.post(url, json=payload) as resp:
-        data = await resp.json()
-        # Handle various Gemini response formats
-        if "error" in data:
-            return f"ERROR: {data['error'].get('message', data['error'])}"
-        candidates = data.get("candidates", [])
-        if not candidates:
-            return f"ERROR: No candidates in response: {data}"
-        content = candidates[0].get("content", {})
-        parts = content.get("parts", [])
-        if not parts:
-            # Try alternate field names
-            text = content.get("text") or candidates[0].get("text")
-            return text if text else f"ERROR: No parts in content: {candidates[0]}"
-        return parts[0].get("text", f"ERROR: No text in parts: {parts[0]}")
+    data = await post_json(session, url, json=payload)
+    # Handle various Gemini response formats
+    if "error" in data:
+        return f"ERROR: {data['error'].get('message', data['error'])}"
+    candidates = data.get("candidates", [])
+    if not candidates:
+        return f"ERROR: No candidates in response: {data}"
+    content = candidates[0].get("content", {})
+    parts = content.get("parts", [])
+    if not parts:
+        # Try alternate field names
+        text = content.get("text") or candidates[0].get("text")
+        return text if text else f"ERROR: No parts in content: {candidates[0]}"
+    return parts[0].get("text", f"ERROR: No text in parts: {parts[0]}")
 
 async def query_zhipu(session, config):
     headers = {"Authorization": f"Bearer {config.api_key}", "Content-Type": "application/json"}
     payload = {"model": config.model, "messages": [{"role": "user", "content": CONSENSUS_PROMPT}]}
-    async with session.post(config.base_url, headers=headers, json=payload) as resp:
-        data = await resp.json()
-        choices = data.get("choices", [])
-        return choices[0]["message"]["content"] if choices else f"ERROR: {data}"
+    data = await post_json(session, config.base_url, headers=headers, json=payload)
+    choices = data.get("choices", [])
+    return choices[0]["message"]["content"] if choices else f"ERROR: {data}"
 
 async def query_llm(session, config):
     try:
@@ -206,7 +218,10 @@ async def run_consensus():
     }
 
     timeout = aiohttp.ClientTimeout(total=90)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
+    # Few requests per host, so cap per-host fan-out and cache DNS lookups
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=4, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector,
+                                     json_serialize=json_dumps) as session:
         # Query all LLMs except Anthropic (we have Claude's opinion already)
         llms_to_query = [c for c in LLMS if c.api_type != "anthropic"]
         tasks = [query_llm(session, config) for config in llms_to_query]